@@ -1,34 +1,350 @@
 import maya.cmds as cmds
 import os
 import maya.utils
+import maya.api.OpenMaya as om
 import time
 import threading
 import socket
 import json
 import traceback
+import uuid
+import collections
+import sys
+import subprocess
+import argparse
+import zlib
+import base64
+import queue
+import logging
+import logging.handlers
+import re
+import hashlib
+import array
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_EXPORT_PATH = r"export_path_save_assets"
+# Marks the line of a worker's stdout that carries its JSON result, since
+# mayapy prints its own startup output around it.
+EXPORT_RESULT_PREFIX = "MAYA_UNREAL_EXPORT_RESULT:"
+# Lines starting with this byte carry base64 zlib data instead of plain JSON.
+COMPRESSED_FRAME_FLAG = b'Z'
+COMPRESSION_THRESHOLD = 4096
+COMPRESSION_LEVEL = 6
+# How long a finished export waits for Unreal to let go of the file it
+# replaces (Windows refuses to replace a file that is open).
+EXPORT_REPLACE_ATTEMPTS = 10
+EXPORT_REPLACE_DELAY = 0.5
+# Upper bound on cached command results; the oldest entries go first.
+RESULT_CACHE_SIZE = 256
+
+
+LOG_LEVEL_ENV = "MAYA_UNREAL_BRIDGE_LOG_LEVEL"
+LOG_RATE_LIMIT = 20
+LOG_RATE_INTERVAL = 1.0
+LOG_HANDLER_NAME = "maya_unreal_bridge.queue"
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop excess INFO/DEBUG records per category before they are queued.
+
+    The category is the logger name, e.g. ``maya_unreal_bridge.recv``. Each
+    category may emit ``max_records`` per ``interval`` seconds, and entries in
+    ``sample_every`` keep only every n-th record of that category. Warnings
+    and errors always pass.
+    """
+
+    def __init__(self, max_records=LOG_RATE_LIMIT, interval=LOG_RATE_INTERVAL, sample_every=None):
+        super().__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self.sample_every = dict(sample_every or {})
+        self.windows = {}
+        self.counts = collections.Counter()
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        category = record.name
+        with self.lock:
+            self.counts[category] += 1
+            sample_every = self.sample_every.get(category)
+            if sample_every and self.counts[category] % sample_every:
+                return False
+            now = time.monotonic()
+            window_start, emitted = self.windows.get(category, (now, 0))
+            if now - window_start >= self.interval:
+                window_start, emitted = now, 0
+            if emitted >= self.max_records:
+                self.windows[category] = (window_start, emitted)
+                return False
+            self.windows[category] = (window_start, emitted + 1)
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted so message formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(level=None, max_records=LOG_RATE_LIMIT, interval=LOG_RATE_INTERVAL, sample_every=None):
+    """Route bridge logging through a queue drained by a background thread.
+
+    The level defaults to ``$MAYA_UNREAL_BRIDGE_LOG_LEVEL`` or INFO; per-message
+    traces are DEBUG, so set DEBUG to see them. Calling this again (e.g. when
+    the script is re-run in the same Maya session) reconfigures in place.
+    """
+    level = level or os.environ.get(LOG_LEVEL_ENV, 'INFO')
+    bridge_logger = logging.getLogger('maya_unreal_bridge')
+    bridge_logger.setLevel(level.upper() if isinstance(level, str) else level)
+    bridge_logger.propagate = False
+
+    # Match by name, not class: re-running the script defines a new
+    # DeferredQueueHandler class, so handlers from the previous run would
+    # fail an isinstance check and keep their listener threads alive.
+    for handler in list(bridge_logger.handlers):
+        if handler.get_name() == LOG_HANDLER_NAME:
+            bridge_logger.removeHandler(handler)
+            listener = getattr(handler, 'listener', None)
+            if listener is not None:
+                listener.stop()
+
+    log_queue = queue.Queue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.set_name(LOG_HANDLER_NAME)
+    queue_handler.addFilter(RateLimitFilter(max_records, interval, sample_every))
+    output_handler = logging.StreamHandler(sys.stdout)
+    output_handler.setFormatter(logging.Formatter('[%(name)s] %(levelname)s: %(message)s'))
+    queue_handler.listener = logging.handlers.QueueListener(log_queue, output_handler)
+    queue_handler.listener.start()
+    bridge_logger.addHandler(queue_handler)
+    return bridge_logger
+
+
+logger = configure_logging()
+net_log = logging.getLogger('maya_unreal_bridge.net')
+recv_log = logging.getLogger('maya_unreal_bridge.recv')
+send_log = logging.getLogger('maya_unreal_bridge.send')
+command_log = logging.getLogger('maya_unreal_bridge.command')
+export_log = logging.getLogger('maya_unreal_bridge.export')
+
+
+def encode_frame(message, compress=False, threshold=COMPRESSION_THRESHOLD, level=COMPRESSION_LEVEL):
+    """Encode one JSON message as a newline-terminated frame.
+
+    Messages are compressed only when the peer negotiated it and the payload
+    is above ``threshold`` bytes, so small interactive replies stay plain.
+    """
+    payload = message.encode('utf-8')
+    if compress and len(payload) > threshold:
+        payload = COMPRESSED_FRAME_FLAG + base64.b64encode(zlib.compress(payload, level))
+    return payload + b'\n'
+
+
+def decode_frame(line):
+    if line.startswith(COMPRESSED_FRAME_FLAG):
+        line = zlib.decompress(base64.b64decode(line[len(COMPRESSED_FRAME_FLAG):]))
+    return line.decode('utf-8')
+
+
+def split_lines(buffer, scan_from=0):
+    """Pop complete newline-terminated lines off the front of a bytearray.
+
+    Returns the lines and the offset to resume scanning from next time, so a
+    large message arriving over many reads is not rescanned from the start.
+    """
+    lines = []
+    start = 0
+    while True:
+        newline = buffer.find(b'\n', scan_from)
+        if newline < 0:
+            break
+        lines.append(bytes(buffer[start:newline]))
+        start = scan_from = newline + 1
+    del buffer[:start]
+    return lines, len(buffer)
+
+
+POLICY_IO_THREAD = 'io'
+POLICY_MAIN_THREAD = 'main'
+POLICY_WORKER = 'worker'
+
+
+class CommandHandler:
+    """A socket command and the execution policy the dispatcher enforces for it.
+
+    ``policy`` is where the handler runs: the client's socket thread, Maya's
+    main thread, or the bridge's worker pool. ``batchable`` handlers may be
+    grouped in a ``batch`` request, and ``cache_ttl`` (seconds) lets an ok
+    result be reused for identical requests until it expires.
+    """
+
+    def __init__(self, name, function, policy=POLICY_IO_THREAD, batchable=False, cache_ttl=None):
+        if policy not in (POLICY_IO_THREAD, POLICY_MAIN_THREAD, POLICY_WORKER):
+            raise ValueError(f"Unknown execution policy for '{name}': {policy}")
+        self.name = name
+        self.function = function
+        self.policy = policy
+        self.batchable = batchable
+        self.cache_ttl = cache_ttl
+
+
+def stable_export_name(scene_file, roots):
+    """Name an export after its scene and roots rather than the time it ran.
+
+    Pushing the same shot again then writes the same .abc and targets the same
+    Unreal asset, which is what lets Unreal skip reimports of unchanged files.
+    The readable part keeps only the leaf names, so a digest of the full root
+    paths is always appended: ``|charA:grp|charA:body`` and
+    ``|charB:grp|charB:body`` must not share a file.
+    """
+    scene_name = os.path.splitext(os.path.basename(scene_file))[0] if scene_file else 'untitled'
+    root_names = sorted(root.split('|')[-1].split(':')[-1] for root in roots)
+    name = re.sub(r'[^A-Za-z0-9_]', '_', '_'.join([scene_name] + root_names))[:55]
+    digest = hashlib.md5('\n'.join(sorted(roots)).encode('utf-8')).hexdigest()[:8]
+    return f"{name}_{digest}"
+
+
+def build_abc_export_command(roots, start_frame, end_frame, export_path):
+    abc_params = "-frameRange {0} {1} ".format(start_frame, end_frame)
+    abc_params += "-attr motionVectorColorSet "
+    abc_params += "-stripNamespaces "
+    abc_params += "-uvWrite "
+    abc_params += "-writeColorSets "
+    abc_params += "-writeFaceSets "
+    abc_params += "-worldSpace "
+    abc_params += "-writeUVSets "
+    abc_params += "-dataFormat ogawa "
+
+    return f"{abc_params} -root {' -root '.join(roots)} -file {export_path}"
+
+
+def write_alembic_atomically(export_path, write):
+    """Call ``write(temp_path)`` and then move the result over ``export_path``.
+
+    Export names are stable, so two jobs for the same roots, or a re-push while
+    Unreal is still hashing the previous file, would otherwise write one file
+    at the same time. Each export goes to its own file next to the target and
+    only a finished file replaces it.
+    """
+    temp_path = f"{os.path.splitext(export_path)[0]}.{uuid.uuid4().hex[:8]}.partial.abc"
+    try:
+        write(temp_path)
+        for attempt in range(EXPORT_REPLACE_ATTEMPTS):
+            try:
+                os.replace(temp_path, export_path)
+                break
+            except PermissionError:
+                if attempt == EXPORT_REPLACE_ATTEMPTS - 1:
+                    raise
+                time.sleep(EXPORT_REPLACE_DELAY)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def run_export_job(job):
+    """Open a scene and export its roots to Alembic; runs inside a mayapy worker."""
+    if not cmds.pluginInfo('AbcExport', query=True, loaded=True):
+        cmds.loadPlugin('AbcExport', quiet=True)
+
+    cmds.file(job['scene_file'], open=True, force=True)
+
+    roots = [cmds.ls(root, long=True)[0] if cmds.objExists(root) else root for root in job['roots']]
+    missing = [root for root in roots if not cmds.objExists(root)]
+    if missing:
+        raise RuntimeError(f"Objects not found in {job['scene_file']}: {', '.join(missing)}")
+
+    frame_range = job.get('frame_range')
+    if frame_range:
+        start_frame, end_frame = frame_range
+    else:
+        start_frame = cmds.playbackOptions(query=True, minTime=True)
+        end_frame = cmds.playbackOptions(query=True, maxTime=True)
+
+    export_dir = os.path.dirname(job['export_path'])
+    if export_dir and not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+
+    write_alembic_atomically(job['export_path'], lambda temp_path: cmds.AbcExport(
+        j=build_abc_export_command(roots, start_frame, end_frame, temp_path)))
+    return {'status': 'ok', 'file_path': job['export_path'], 'objects': roots}
+
+
+def sample_world_matrices(objects, frames):
+    """Evaluate the world matrix of every object at every frame without moving the timeline.
+
+    Each frame is evaluated through an MDGContext, so the current time and the
+    viewport are left alone. Returns a flat float64 array laid out as
+    [frame][object][16 row-major matrix elements]. Must run on the main thread.
+    """
+    selection = om.MSelectionList()
+    for obj in objects:
+        selection.add(obj)
+
+    plugs = []
+    for index in range(selection.length()):
+        dag_path = selection.getDagPath(index)
+        world_matrix = om.MFnDagNode(dag_path).findPlug('worldMatrix', False)
+        plugs.append(world_matrix.elementByLogicalIndex(dag_path.instanceNumber()))
+
+    values = array.array('d')
+    time_unit = om.MTime.uiUnit()
+    for frame in frames:
+        context = om.MDGContext(om.MTime(frame, time_unit))
+        if hasattr(om, 'MDGContextGuard'):
+            with om.MDGContextGuard(context):
+                for plug in plugs:
+                    values.extend(om.MFnMatrixData(plug.asMObject()).matrix())
+        else:
+            for plug in plugs:
+                values.extend(om.MFnMatrixData(plug.asMObject(context)).matrix())
+    return values
 
 
 class MayaUnrealSocketBridge:
-    def __init__(self, host="127.0.0.1", port=12112):
+    def __init__(self, host="127.0.0.1", port=12112, replay_log_size=256,
+                 compression_threshold=COMPRESSION_THRESHOLD, compression_level=COMPRESSION_LEVEL):
         self.host = host
         self.port = port
-        self.buffer_size = 4096
+        self.buffer_size = 65536
         self.socket_server = None
         self.client_socket = None
         self.server_thread = None
         self.is_running = False
         self.connected_clients = []
+        # Broadcasts carry a per-session sequence number and are kept in a
+        # bounded log so a reconnecting client can resume where it left off.
+        self.session_id = uuid.uuid4().hex
+        self.sequence = 0
+        self.replay_log = collections.deque(maxlen=replay_log_size)
+        self.send_lock = threading.RLock()
+        # Clients that negotiated zlib in their hello get large messages compressed.
+        self.client_compression = {}
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self.export_service = None
+        # Commands are dispatched through a registry; each handler declares
+        # where it runs and whether its results may be batched or cached.
+        self.command_handlers = {}
+        self.worker_pool = ThreadPoolExecutor(max_workers=4)
+        self.result_cache = {}
+        self.cache_lock = threading.Lock()
+        self._register_builtin_commands()
 
     def start_server(self):
         if self.is_running:
-            print("Socket server is already running")
+            net_log.info("Socket server is already running")
             return
 
         try:
             import socket
             import threading
         except ImportError as e:
-            print(f"Failed to import required modules: {str(e)}")
+            net_log.error("Failed to import required modules: %s", e)
             return False
 
         try:
@@ -38,7 +354,7 @@ class MayaUnrealSocketBridge:
             self.socket_server.listen(5)
             self.is_running = True
 
-            print(f"Maya socket server started on {self.host}:{self.port}")
+            net_log.info("Maya socket server started on %s:%s", self.host, self.port)
 
             self.server_thread = threading.Thread(target=self.accept_connections)
             self.server_thread.daemon = True
@@ -46,7 +362,7 @@ class MayaUnrealSocketBridge:
 
             return True
         except Exception as e:
-            print(f"Failed to start socket server: {str(e)}")
+            net_log.error("Failed to start socket server: %s", e)
             return False
 
     def accept_connections(self):
@@ -54,7 +370,7 @@ class MayaUnrealSocketBridge:
         try:
             import socket
         except ImportError as e:
-            print(f"Failed to import 'socket' module: {str(e)}")
+            net_log.error("Failed to import 'socket' module: %s", e)
             return
 
         self.socket_server.settimeout(1.0)
@@ -62,7 +378,7 @@ class MayaUnrealSocketBridge:
         while self.is_running:
             try:
                 client_socket, address = self.socket_server.accept()
-                print(f"Connection established with {address}")
+                net_log.info("Connection established with %s", address)
                 self.connected_clients.append(client_socket)
                 client_thread = threading.Thread(target=self.handle_client, args=(client_socket,))
                 client_thread.daemon = True
@@ -71,155 +387,360 @@ class MayaUnrealSocketBridge:
                 continue
             except Exception as e:
                 if self.is_running:
-                    print(f"Error accepting connection: {str(e)}")
+                    net_log.error("Error accepting connection: %s", e)
 
     def handle_client(self, client_socket):
         try:
             import json
         except ImportError as e:
-            print(f"Failed to import 'json' module: {str(e)}")
+            logger.error("Failed to import 'json' module: %s", e)
             return
+        pending = bytearray()
+        scanned = 0
         try:
             while self.is_running:
                 data = client_socket.recv(self.buffer_size)
                 if not data:
                     break
 
-                message = data.decode('utf-8')
-                print(f"Received from Unreal: {message}")
-
-                self.process_message(message, client_socket)
+                # Messages are newline-delimited JSON; a single recv may hold
+                # several messages or only part of one.
+                pending += data
+                lines, scanned = split_lines(pending, scanned)
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        message = decode_frame(line)
+                    except (zlib.error, ValueError) as e:
+                        recv_log.warning("Discarding undecodable message from Unreal: %s", e)
+                        continue
+                    recv_log.debug("Received from Unreal: %s", message)
+
+                    self.process_message(message, client_socket)
 
         except Exception as e:
-            print(f"Error handling client: {str(e)}")
+            net_log.error("Error handling client: %s", e)
         finally:
             if client_socket in self.connected_clients:
                 self.connected_clients.remove(client_socket)
+            self.client_compression.pop(client_socket, None)
             client_socket.close()
 
+    def register_command(self, name, function, policy=POLICY_IO_THREAD, batchable=False, cache_ttl=None):
+        self.command_handlers[name] = CommandHandler(name, function, policy, batchable, cache_ttl)
+
+    def _register_builtin_commands(self):
+        self.register_command('ping', self._handle_ping)
+        self.register_command('hello', self._handle_hello)
+        self.register_command('export', self._handle_export)
+        self.register_command('get_selection', self._handle_get_selection, policy=POLICY_MAIN_THREAD)
+        self.register_command('get_transform', self._handle_get_transform, policy=POLICY_MAIN_THREAD,
+                              batchable=True)
+        self.register_command('bake_transforms', self._handle_bake_transforms, policy=POLICY_MAIN_THREAD)
+
     def process_message(self, message, client_socket):
         try:
             import json
         except ImportError as e:
-            print(f"Failed to import 'json' module: {str(e)}")
+            logger.error("Failed to import 'json' module: %s", e)
             return
+        data = None
         try:
             data = json.loads(message)
-            command = data.get('command')
-            command_id = data.get('id')
-            if command == 'ping':
-                self.send_response(client_socket, {'status': 'ok', 'message': 'pong', 'id': command_id})
-            elif command == 'get_selection':
-                try:
-                    def get_selection_in_main_thread():
-                        try:
-                            selected = cmds.ls(selection=True)
-                            print(f"Selected objects: {selected}")
-                            return selected
-                        except Exception as e:
-                            print(f"Error in get_selection_in_main_thread: {str(e)}")
-                            return []
-
-                    selected = maya.utils.executeInMainThreadWithResult(get_selection_in_main_thread)
-                    long_selected = []
-                    for obj in selected:
-                        try:
-                            long_name = cmds.ls(obj, long=True)
-                            if long_name:
-                                long_selected.append(long_name[0])
-                            else:
-                                long_selected.append(obj)
-                        except:
-                            long_selected.append(obj)
-                    self.send_response(client_socket, {
-                        'status': 'ok',
-                        'selection': long_selected,
-                        'id': command_id
-                    })
-                except Exception as sel_error:
-                    print(f"Error getting selection: {str(sel_error)}")
-                    self.send_response(client_socket, {
-                        'status': 'error',
-                        'message': f"Could not get selection: {str(sel_error)}",
-                        'id': command_id
-                    })
-            elif command == 'get_transform':
-                obj_name = data.get('object')
-                if obj_name and cmds.objExists(obj_name):
-                    translation = cmds.xform(obj_name, query=True, worldSpace=True, translation=True)
-                    rotation = cmds.xform(obj_name, query=True, worldSpace=True, rotation=True)
-                    scale = cmds.xform(obj_name, query=True, worldSpace=True, scale=True)
-
-                    self.send_response(client_socket, {
-                        'status': 'ok',
-                        'transform': {
-                            'translation': translation,
-                            'rotation': rotation,
-                            'scale': scale
-                        },
-                        'id': command_id
-                    })
-                else:
-                    self.send_response(client_socket, {
-                        'status': 'error',
-                        'message': f"Object '{obj_name}' not found",
-                        'id': command_id
-                    })
-
-            else:
+            if not isinstance(data, dict):
                 self.send_response(client_socket, {
                     'status': 'error',
-                    'message': f"Unknown command: {command}",
-                    'id': command_id
+                    'message': 'Message must be a JSON object'
                 })
+            elif data.get('command') == 'batch':
+                self.dispatch_batch(data, client_socket)
+            else:
+                self.dispatch_command(data, client_socket)
 
         except json.JSONDecodeError:
             self.send_response(client_socket, {
                 'status': 'error',
-                'message': 'Invalid JSON format'
+                'message': 'Invalid JSON format',
+                'id': None
             })
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
-            print(f"Error processing message: {str(e)}")
-            print(f"Error details: {error_details}")
+            command_log.error("Error processing message: %s\n%s", e, error_details)
             self.send_response(client_socket, {
                 'status': 'error',
-                'message': str(e)
+                'message': str(e),
+                'id': data.get('id') if isinstance(data, dict) else None
             })
 
+    def dispatch_command(self, data, client_socket):
+        """Run one command under the policy its handler declared and send the reply."""
+        command = data.get('command')
+        command_id = data.get('id')
+        handler = self.command_handlers.get(command)
+        if handler is None:
+            self.send_response(client_socket, {
+                'status': 'error',
+                'message': f"Unknown command: {command}",
+                'id': command_id
+            })
+            return
+
+        cached = self._get_cached_result(handler, data)
+        if cached is not None:
+            self.send_response(client_socket, dict(cached, id=command_id))
+            return
+
+        if handler.policy == POLICY_WORKER:
+            self.worker_pool.submit(self._execute_and_respond, handler, data, client_socket)
+        else:
+            self._execute_and_respond(handler, data, client_socket)
+
+    def dispatch_batch(self, data, client_socket):
+        """Run several batchable commands, with all main-thread ones in a single hop.
+
+        Worker-policy items run on the worker pool alongside that hop.
+        """
+        results = []
+        main_thread_items = []
+        worker_items = []
+        items = data.get('commands', [])
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({'status': 'error', 'message': 'Batched command must be a JSON object'})
+                continue
+            handler = self.command_handlers.get(item.get('command'))
+            if handler is None or not handler.batchable:
+                results.append({
+                    'status': 'error',
+                    'message': f"Command cannot be batched: {item.get('command')}"
+                })
+                continue
+            cached = self._get_cached_result(handler, item)
+            if cached is not None:
+                results.append(cached)
+            elif handler.policy == POLICY_MAIN_THREAD:
+                results.append(None)
+                main_thread_items.append((index, handler, item))
+            elif handler.policy == POLICY_WORKER:
+                results.append(None)
+                worker_items.append((index, self.worker_pool.submit(self._execute, handler, item, client_socket)))
+            else:
+                results.append(self._execute(handler, item, client_socket))
+
+        if main_thread_items:
+            main_results = maya.utils.executeInMainThreadWithResult(
+                lambda: [self._execute(handler, item, client_socket, in_main_thread=True)
+                         for _, handler, item in main_thread_items]
+            )
+            for (index, _, _), result in zip(main_thread_items, main_results):
+                results[index] = result
+        for index, future in worker_items:
+            results[index] = future.result()
+
+        for item, result in zip(items, results):
+            if result is not None and isinstance(item, dict) and 'id' in item:
+                result['id'] = item['id']
+        self.send_response(client_socket, {'status': 'ok', 'results': results, 'id': data.get('id')})
+
+    def _execute(self, handler, data, client_socket, in_main_thread=False):
+        try:
+            if handler.policy == POLICY_MAIN_THREAD and not in_main_thread:
+                result = maya.utils.executeInMainThreadWithResult(handler.function, data, client_socket)
+            else:
+                result = handler.function(data, client_socket)
+        except Exception as e:
+            command_log.error("Error running command '%s': %s", handler.name, e)
+            return {'status': 'error', 'message': str(e)}
+        if result is not None and handler.cache_ttl and result.get('status') == 'ok':
+            self._store_cached_result(handler, data, result)
+        return result
+
+    def _execute_and_respond(self, handler, data, client_socket):
+        result = self._execute(handler, data, client_socket)
+        # Handlers that stream their own replies return None.
+        if result is not None:
+            self.send_response(client_socket, dict(result, id=data.get('id')))
+
+    def _cache_key(self, data):
+        return json.dumps({key: value for key, value in data.items() if key != 'id'}, sort_keys=True)
+
+    def _get_cached_result(self, handler, data):
+        if not handler.cache_ttl:
+            return None
+        key = self._cache_key(data)
+        with self.cache_lock:
+            entry = self.result_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.result_cache[key]
+                return None
+            return dict(entry[1])
+
+    def _store_cached_result(self, handler, data, result):
+        key = self._cache_key(data)
+        now = time.monotonic()
+        with self.cache_lock:
+            # Sweep on insert as well, so keys that are never asked for again
+            # still expire, then drop the oldest entries if still over size.
+            for expired in [k for k, entry in self.result_cache.items() if entry[0] < now]:
+                del self.result_cache[expired]
+            self.result_cache.pop(key, None)
+            while len(self.result_cache) >= RESULT_CACHE_SIZE:
+                del self.result_cache[next(iter(self.result_cache))]
+            self.result_cache[key] = (now + handler.cache_ttl, dict(result))
+
+    def _handle_ping(self, data, client_socket):
+        return {'status': 'ok', 'message': 'pong'}
+
+    def _handle_hello(self, data, client_socket):
+        compression = 'zlib' if 'zlib' in (data.get('compression') or []) else None
+        self.client_compression[client_socket] = compression == 'zlib'
+        self.resume_client(client_socket, data.get('session'), data.get('last_seq', 0), data.get('id'),
+                           compression)
+
+    def _handle_export(self, data, client_socket):
+        if self.export_service is None:
+            return {
+                'status': 'error',
+                'message': "Export requests are only accepted by a headless export service"
+            }
+        self.export_service.submit(data, client_socket, data.get('id'))
+
+    def _handle_get_selection(self, data, client_socket):
+        selected = cmds.ls(selection=True, long=True) or []
+        command_log.debug("Selected objects: %s", selected)
+        return {'status': 'ok', 'selection': selected}
+
+    def _handle_get_transform(self, data, client_socket):
+        obj_name = data.get('object')
+        if not obj_name or not cmds.objExists(obj_name):
+            return {'status': 'error', 'message': f"Object '{obj_name}' not found"}
+
+        translation = cmds.xform(obj_name, query=True, worldSpace=True, translation=True)
+        rotation = cmds.xform(obj_name, query=True, worldSpace=True, rotation=True)
+        scale = cmds.xform(obj_name, query=True, worldSpace=True, scale=True)
+        return {
+            'status': 'ok',
+            'transform': {
+                'translation': translation,
+                'rotation': rotation,
+                'scale': scale
+            }
+        }
+
+    def _handle_bake_transforms(self, data, client_socket):
+        objects = data.get('objects') or []
+        missing = [obj for obj in objects if not cmds.objExists(obj)]
+        if not objects or missing:
+            return {'status': 'error', 'message': f"Objects not found: {', '.join(missing) or 'none given'}"}
+
+        start_frame = data.get('start_frame')
+        if start_frame is None:
+            start_frame = cmds.playbackOptions(query=True, minTime=True)
+        end_frame = data.get('end_frame')
+        if end_frame is None:
+            end_frame = cmds.playbackOptions(query=True, maxTime=True)
+        step = data.get('step', 1.0)
+        if step <= 0 or end_frame < start_frame:
+            return {'status': 'error', 'message': "Invalid frame range or step"}
+
+        frame_count = int((end_frame - start_frame) / step + 1e-6) + 1
+        frames = [start_frame + index * step for index in range(frame_count)]
+        long_names = [cmds.ls(obj, long=True)[0] for obj in objects]
+
+        values = sample_world_matrices(long_names, frames)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return {
+            'status': 'ok',
+            'objects': long_names,
+            'frames': frames,
+            'shape': [len(frames), len(long_names), 4, 4],
+            'dtype': '<f8',
+            'matrices': base64.b64encode(values.tobytes()).decode('ascii')
+        }
+
     def send_response(self, client_socket, data):
         try:
             import json
         except ImportError as e:
-            print(f"Failed to import 'json' module: {str(e)}")
+            logger.error("Failed to import 'json' module: %s", e)
             return
 
         try:
-            response = json.dumps(data)
-            client_socket.sendall(response.encode('utf-8'))
+            response = encode_frame(json.dumps(data), self.client_compression.get(client_socket, False),
+                                    self.compression_threshold, self.compression_level)
+            with self.send_lock:
+                client_socket.sendall(response)
         except Exception as e:
-            print(f"Error sending response: {str(e)}")
+            send_log.error("Error sending response: %s", e)
+
+    def resume_client(self, client_socket, session, last_seq, command_id, compression=None):
+        """Replay broadcasts the client missed since ``last_seq``.
+
+        The replay and the reply are sent under ``send_lock`` so no live
+        broadcast can overtake a replayed one on this socket.
+        """
+        with self.send_lock:
+            resync_required = False
+            missed = []
+            if session == self.session_id:
+                missed = [entry for entry in self.replay_log if entry['seq'] > last_seq]
+                oldest_seq = self.replay_log[0]['seq'] if self.replay_log else self.sequence + 1
+                if last_seq + 1 < oldest_seq:
+                    resync_required = True
+            elif session:
+                # Maya restarted since the client last saw it, so the old
+                # session's broadcasts are gone.
+                resync_required = True
+
+            for entry in missed:
+                self.send_response(client_socket, entry)
+
+            self.send_response(client_socket, {
+                'status': 'ok',
+                'message': 'resumed',
+                'session': self.session_id,
+                'seq': self.sequence,
+                'replayed': len(missed),
+                'resync_required': resync_required,
+                'compression': compression,
+                'id': command_id
+            })
 
     def broadcast_to_clients(self, data):
         try:
             import json
         except ImportError as e:
-            print(f"Failed to import 'json' module: {str(e)}")
+            logger.error("Failed to import 'json' module: %s", e)
             return
 
-        message = json.dumps(data)
         disconnected_clients = []
 
-        for client in self.connected_clients:
-            try:
-                client.sendall(message.encode('utf-8'))
-            except:
-                disconnected_clients.append(client)
+        with self.send_lock:
+            self.sequence += 1
+            data = dict(data, session=self.session_id, seq=self.sequence)
+            self.replay_log.append(data)
+            message = json.dumps(data)
+            frames = {}
+
+            for client in list(self.connected_clients):
+                compress = self.client_compression.get(client, False)
+                if compress not in frames:
+                    frames[compress] = encode_frame(message, compress,
+                                                    self.compression_threshold, self.compression_level)
+                try:
+                    client.sendall(frames[compress])
+                except:
+                    disconnected_clients.append(client)
 
         for client in disconnected_clients:
             if client in self.connected_clients:
                 self.connected_clients.remove(client)
+            self.client_compression.pop(client, None)
 
     def stop_server(self):
         self.is_running = False
@@ -230,6 +751,7 @@ class MayaUnrealSocketBridge:
             except:
                 pass
         self.connected_clients = []
+        self.client_compression = {}
 
         if self.socket_server:
             try:
@@ -238,18 +760,179 @@ class MayaUnrealSocketBridge:
                 pass
             self.socket_server = None
 
-        print("Socket server stopped")
+        net_log.info("Socket server stopped")
+
+
+class HeadlessExportService:
+    """Runs ``export`` requests through a pool of mayapy worker processes.
+
+    Each job opens its scene in a fresh mayapy, so exports of different
+    shots run in parallel and never touch the service's own Maya session.
+    Workers are not kept alive between jobs: every job pays mayapy's startup
+    and plug-in load time (often several seconds), which is worth it for
+    scene-sized exports but not for many tiny ones. Output files always go
+    under ``export_path``, named from the scene and roots; clients cannot
+    choose the location. Results are broadcast to every connected client as
+    ``import_alembic``, or ``export_failed`` when the worker does not produce
+    a file.
+    """
+
+    def __init__(self, bridge, max_workers=2, export_path=DEFAULT_EXPORT_PATH, mayapy=None, job_timeout=None):
+        self.bridge = bridge
+        self.export_path = export_path
+        self.mayapy = mayapy or sys.executable
+        self.job_timeout = job_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        if not os.path.exists(self.export_path):
+            os.makedirs(self.export_path)
+
+    def submit(self, data, client_socket, command_id):
+        # Everything here ends up in the AbcExport job string of a worker, so
+        # only plain values are let through; anything else could smuggle in
+        # extra flags such as -pythonPerFrameCallback.
+        try:
+            scene_file, roots, frame_range, material_import_method = self._validate_request(data)
+        except ValueError as e:
+            self.bridge.send_response(client_socket, {
+                'status': 'error',
+                'message': str(e),
+                'id': command_id
+            })
+            return None
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'job_id': job_id,
+            'scene_file': scene_file,
+            'roots': roots,
+            'frame_range': frame_range,
+            'material_import_method': material_import_method,
+            'export_path': os.path.abspath(
+                os.path.join(self.export_path, f"{stable_export_name(scene_file, roots)}.abc"))
+        }
+        self.bridge.send_response(client_socket, {
+            'status': 'ok',
+            'message': 'export_queued',
+            'job_id': job_id,
+            'id': command_id
+        })
+        self.executor.submit(self._run_job, job)
+        return job_id
+
+    def _validate_request(self, data):
+        scene_file = data.get('scene_file')
+        roots = data.get('roots') or []
+        if not scene_file or not roots:
+            raise ValueError("Export requests need 'scene_file' and 'roots'")
+        if not isinstance(scene_file, str) or not isinstance(roots, list) \
+                or not all(isinstance(root, str) for root in roots):
+            raise ValueError("'scene_file' must be a string and 'roots' a list of strings")
+
+        frame_range = data.get('frame_range')
+        if frame_range is not None:
+            if not isinstance(frame_range, list) or len(frame_range) != 2:
+                raise ValueError("'frame_range' must be a [start, end] pair")
+            try:
+                frame_range = [float(frame) for frame in frame_range]
+            except (TypeError, ValueError):
+                raise ValueError("'frame_range' must contain two numbers")
+
+        material_import_method = data.get('material_import_method', 'find')
+        if material_import_method not in ('find', 'create'):
+            raise ValueError("'material_import_method' must be 'find' or 'create'")
+        return scene_file, roots, frame_range, material_import_method
+
+    def _run_job(self, job):
+        export_log.info("Export job %s started: %s", job['job_id'], job['scene_file'])
+        try:
+            completed = subprocess.run(
+                [self.mayapy, os.path.abspath(__file__), '--export-job', json.dumps(job)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                timeout=self.job_timeout
+            )
+            result = None
+            for line in completed.stdout.splitlines():
+                if line.startswith(EXPORT_RESULT_PREFIX):
+                    result = json.loads(line[len(EXPORT_RESULT_PREFIX):])
+            if result is None:
+                result = {'status': 'error', 'message': f"Worker exited with code {completed.returncode}"}
+                export_log.warning("Export job %s output:\n%s", job['job_id'], completed.stdout)
+        except Exception as e:
+            result = {'status': 'error', 'message': str(e)}
+
+        if result.get('status') == 'ok':
+            export_log.info("Export job %s finished: %s", job['job_id'], result['file_path'])
+            self.bridge.broadcast_to_clients({
+                'command': 'import_alembic',
+                'file_path': result['file_path'],
+                'objects': result.get('objects', job['roots']),
+                'material_import_method': job['material_import_method'],
+                'job_id': job['job_id'],
+                'scene_file': job['scene_file']
+            })
+        else:
+            export_log.error("Export job %s failed: %s", job['job_id'], result.get('message'))
+            self.bridge.broadcast_to_clients({
+                'command': 'export_failed',
+                'job_id': job['job_id'],
+                'scene_file': job['scene_file'],
+                'message': result.get('message', 'Unknown error')
+            })
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+def run_service(args):
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+
+    bridge = MayaUnrealSocketBridge(host=args.host, port=args.port)
+    bridge.export_service = HeadlessExportService(
+        bridge, max_workers=args.workers, export_path=args.export_path, job_timeout=args.job_timeout)
+    if not bridge.start_server():
+        return 1
+
+    try:
+        while bridge.is_running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bridge.export_service.shutdown()
+        bridge.stop_server()
+        maya.standalone.uninitialize()
+    return 0
+
+
+def run_worker(job_json):
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    try:
+        result = run_export_job(json.loads(job_json))
+    except Exception as e:
+        traceback.print_exc()
+        result = {'status': 'error', 'message': str(e)}
+    print(f"{EXPORT_RESULT_PREFIX}{json.dumps(result)}")
+    sys.stdout.flush()
+    maya.standalone.uninitialize()
+    return 0 if result['status'] == 'ok' else 1
 
 
 class SocketBridgeUI:
     def __init__(self, bridge):
         self.bridge = bridge
         self.selected_objects = []
-        self.default_export_path = r"export_path_save_assets"
+        self.default_export_path = DEFAULT_EXPORT_PATH
         self.progress_control = None
         self.cancel_export = False
         self.window_name = "mayaUnrealSocketBridge"
         self.export_frame = None
+        self.pipelined_checkbox = None
+        self.group_size_field = None
 
         if not os.path.exists(self.default_export_path):
             os.makedirs(self.default_export_path)
@@ -354,7 +1037,7 @@ class SocketBridgeUI:
             label="Export Controls",
             collapsable=True,
             width=430,
-            height=120,
+            height=175,
             parent=form_layout
         )
 
@@ -364,6 +1047,20 @@ class SocketBridgeUI:
             parent=self.export_frame
         )
 
+        self.pipelined_checkbox = cmds.checkBox(
+            label="Pipelined export (send each file to Unreal as soon as it is written)",
+            value=False,
+            parent=export_col_layout
+        )
+
+        self.group_size_field = cmds.intFieldGrp(
+            label="Roots per file",
+            numberOfFields=1,
+            value1=1,
+            columnWidth2=(100, 60),
+            parent=export_col_layout
+        )
+
         self.export_btn = cmds.button(
             label="Export to Unreal",
             command=lambda x: self.export_alembic_to_unreal(),
@@ -463,19 +1160,86 @@ class SocketBridgeUI:
 
         self.update_progress(0)
 
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        default_filename = f"export_{timestamp}.abc"
+        scene_file = cmds.file(query=True, sceneName=True)
+        default_filename = f"{stable_export_name(scene_file, selected)}.abc"
         export_path = os.path.join(self.default_export_path, default_filename)
 
+        pipelined = bool(self.pipelined_checkbox and cmds.checkBox(self.pipelined_checkbox, query=True, value=True))
+        group_size = 1
+        if self.group_size_field:
+            group_size = max(1, cmds.intFieldGrp(self.group_size_field, query=True, value1=True))
+
         export_thread = threading.Thread(
             target=self._perform_alembic_export,
-            args=(selected, export_path)
+            args=(selected, export_path, pipelined, group_size, scene_file)
         )
         export_thread.start()
 
         return True
 
-    def _perform_alembic_export(self, selected, export_path):
+    def _perform_pipelined_export(self, selected, export_path, group_size,
+                                  start_frame, end_frame, material_import_method, scene_file=None):
+        """Export roots in groups and broadcast each file as soon as it is written.
+
+        Unreal imports file k on its own tick while Maya exports file k+1, so
+        the total time approaches max(export, import) instead of their sum.
+        """
+        export_dir = os.path.dirname(export_path)
+        batch_id = f"export_{time.strftime('%Y%m%d_%H%M%S')}"
+        groups = [selected[i:i + group_size] for i in range(0, len(selected), group_size)]
+        part_count = len(groups)
+        exported_files = []
+        failed = False
+
+        try:
+            self._export_pipelined_parts(groups, export_dir, scene_file, batch_id, start_frame, end_frame,
+                                         material_import_method, exported_files)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            # Always close the batch so Unreal learns it ended, even when an
+            # export raised partway through.
+            cancelled = not failed and len(exported_files) < part_count
+            self.bridge.broadcast_to_clients({
+                'command': 'import_alembic_batch_complete',
+                'batch_id': batch_id,
+                'file_paths': exported_files,
+                'objects': selected,
+                'cancelled': cancelled,
+                'failed': failed
+            })
+        return not cancelled
+
+    def _export_pipelined_parts(self, groups, export_dir, scene_file, batch_id, start_frame, end_frame,
+                                material_import_method, exported_files):
+        part_count = len(groups)
+        for part_index, roots in enumerate(groups):
+            if self.cancel_export:
+                break
+
+            part_path = os.path.join(export_dir, f"{stable_export_name(scene_file, roots)}.abc")
+            write_alembic_atomically(part_path, lambda temp_path: maya.utils.executeInMainThreadWithResult(
+                lambda: cmds.AbcExport(j=build_abc_export_command(roots, start_frame, end_frame, temp_path))
+            ))
+            exported_files.append(part_path)
+
+            self.bridge.broadcast_to_clients({
+                'command': 'import_alembic',
+                'file_path': part_path,
+                'objects': roots,
+                'material_import_method': material_import_method,
+                'batch_id': batch_id,
+                'part_index': part_index,
+                'part_count': part_count
+            })
+
+            progress = 30 + int(60 * (part_index + 1) / part_count)
+            maya.utils.executeInMainThreadWithResult(
+                lambda: self.update_progress(progress)
+            )
+
+    def _perform_alembic_export(self, selected, export_path, pipelined=False, group_size=1, scene_file=None):
         try:
             maya.utils.executeInMainThreadWithResult(
                 lambda: self.update_progress(10)
@@ -517,24 +1281,29 @@ class SocketBridgeUI:
                 lambda: self.update_progress(30)
             )
 
-            abc_params = "-frameRange {0} {1} ".format(start_frame, end_frame)
-            abc_params += "-attr motionVectorColorSet "
-            abc_params += "-stripNamespaces "
-            abc_params += "-uvWrite "
-            abc_params += "-writeColorSets "
-            abc_params += "-writeFaceSets "
-            abc_params += "-worldSpace "
-            abc_params += "-writeUVSets "
-            abc_params += "-dataFormat ogawa "
+            if pipelined:
+                if not self._perform_pipelined_export(selected, export_path, group_size, start_frame,
+                                                      end_frame, material_import_method, scene_file):
+                    maya.utils.executeInMainThreadWithResult(
+                        lambda: cmds.warning("Alembic export cancelled")
+                    )
+                    return False
+
+                maya.utils.executeInMainThreadWithResult(
+                    lambda: self.update_progress(100)
+                )
+                maya.utils.executeInMainThreadWithResult(
+                    lambda: print(f"Alembic files exported successfully to: {os.path.dirname(export_path)}")
+                )
+                return True
 
             maya.utils.executeInMainThreadWithResult(
                 lambda: self.update_progress(50)
             )
 
-            export_command = f"{abc_params} -root {' -root '.join(selected)} -file {export_path}"
-            maya.utils.executeInMainThreadWithResult(
-                lambda: cmds.AbcExport(j=export_command)
-            )
+            write_alembic_atomically(export_path, lambda temp_path: maya.utils.executeInMainThreadWithResult(
+                lambda: cmds.AbcExport(j=build_abc_export_command(selected, start_frame, end_frame, temp_path))
+            ))
 
             maya.utils.executeInMainThreadWithResult(
                 lambda: self.update_progress(80)
@@ -574,6 +1343,22 @@ class SocketBridgeUI:
 
 
 if __name__ == "__main__":
-    bridge = MayaUnrealSocketBridge()
-    ui = SocketBridgeUI(bridge)
-    ui.create_ui()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Maya-Unreal socket bridge")
+    parser.add_argument('--service', action='store_true', help="Run headless under mayapy and accept export requests")
+    parser.add_argument('--export-job', help=argparse.SUPPRESS)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=12112)
+    parser.add_argument('--workers', type=int, default=2, help="Number of parallel mayapy export processes")
+    parser.add_argument('--export-path', default=DEFAULT_EXPORT_PATH)
+    parser.add_argument('--job-timeout', type=float, default=None, help="Seconds before an export job is abandoned")
+    # Inside interactive Maya sys.argv holds Maya's own arguments.
+    args, _ = parser.parse_known_args()
+
+    if args.export_job:
+        sys.exit(run_worker(args.export_job))
+    elif args.service:
+        sys.exit(run_service(args))
+    else:
+        bridge = MayaUnrealSocketBridge()
+        ui = SocketBridgeUI(bridge)
+        ui.create_ui()
\ No newline at end of file
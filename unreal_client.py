@@ -1,134 +1,726 @@
 import unreal
 import socket
+import selectors
+import errno
 import json
 import threading
 import time
 import os
 import queue
+import random
+import hashlib
+import traceback
+import zlib
+import base64
+import collections
+import math
+import array
+import sys
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 HOST = "127.0.0.1"
 PORT = 12112
-BUFFER_SIZE = 4096
+BUFFER_SIZE = 65536
+DEFAULT_ENDPOINT = "default"
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+# Wall-clock time the editor tick may spend draining Maya messages per frame.
+TICK_BUDGET_SECONDS = 0.008
+HASH_CHUNK_SIZE = 1024 * 1024
+# Lines starting with this byte carry base64 zlib data instead of plain JSON.
+COMPRESSED_FRAME_FLAG = b'Z'
+COMPRESSION_THRESHOLD = 4096
+COMPRESSION_LEVEL = 6
+
+# Asset metadata tags describing the .abc an asset was last imported from.
+FINGERPRINT_TAGS = {
+    'size': 'MayaBridgeSourceSize',
+    'mtime': 'MayaBridgeSourceMtime',
+    'hash': 'MayaBridgeSourceHash',
+    'settings': 'MayaBridgeImportSettings',
+}
+
+# Maya-to-Unreal axis conversion, shared by the Alembic import settings and
+# baked transforms: scale first, then rotation as (roll, pitch, yaw) degrees.
+MAYA_TO_UNREAL_SCALE = (1.0, -1.0, 1.0)
+MAYA_TO_UNREAL_ROTATION = (90.0, 0.0, 0.0)
+
+CONNECT_IN_PROGRESS = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY,
+                       getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK))
+
+
+LOG_LEVEL_ENV = "MAYA_UNREAL_BRIDGE_LOG_LEVEL"
+LOG_RATE_LIMIT = 20
+LOG_RATE_INTERVAL = 1.0
+LOG_HANDLER_NAME = "maya_unreal_bridge.queue"
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop excess INFO/DEBUG records per category before they are queued.
+
+    The category is the logger name, e.g. ``maya_unreal_bridge.recv``. Each
+    category may emit ``max_records`` per ``interval`` seconds, and entries in
+    ``sample_every`` keep only every n-th record of that category. Warnings
+    and errors always pass.
+    """
+
+    def __init__(self, max_records=LOG_RATE_LIMIT, interval=LOG_RATE_INTERVAL, sample_every=None):
+        super().__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self.sample_every = dict(sample_every or {})
+        self.windows = {}
+        self.counts = collections.Counter()
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        category = record.name
+        with self.lock:
+            self.counts[category] += 1
+            sample_every = self.sample_every.get(category)
+            if sample_every and self.counts[category] % sample_every:
+                return False
+            now = time.monotonic()
+            window_start, emitted = self.windows.get(category, (now, 0))
+            if now - window_start >= self.interval:
+                window_start, emitted = now, 0
+            if emitted >= self.max_records:
+                self.windows[category] = (window_start, emitted)
+                return False
+            self.windows[category] = (window_start, emitted + 1)
+        return True
 
-class UnrealMayaSocketClient:
-    def __init__(self):
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted so message formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class UnrealLogHandler(logging.Handler):
+    """Write records to the editor Output Log at the matching severity."""
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+            if record.levelno >= logging.ERROR:
+                unreal.log_error(message)
+            elif record.levelno >= logging.WARNING:
+                unreal.log_warning(message)
+            else:
+                unreal.log(message)
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(level=None, max_records=LOG_RATE_LIMIT, interval=LOG_RATE_INTERVAL, sample_every=None):
+    """Route bridge logging to the Output Log through a background thread.
+
+    The level defaults to ``$MAYA_UNREAL_BRIDGE_LOG_LEVEL`` or INFO; every
+    send and receive is traced at DEBUG. Calling this again reconfigures
+    in place instead of stacking handlers.
+    """
+    level = level or os.environ.get(LOG_LEVEL_ENV, 'INFO')
+    bridge_logger = logging.getLogger('maya_unreal_bridge')
+    bridge_logger.setLevel(level.upper() if isinstance(level, str) else level)
+    bridge_logger.propagate = False
+
+    # Match by name, not class: re-running the script defines a new
+    # DeferredQueueHandler class, so handlers from the previous run would
+    # fail an isinstance check and keep their listener threads alive.
+    for handler in list(bridge_logger.handlers):
+        if handler.get_name() == LOG_HANDLER_NAME:
+            bridge_logger.removeHandler(handler)
+            listener = getattr(handler, 'listener', None)
+            if listener is not None:
+                listener.stop()
+
+    log_queue = queue.Queue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.set_name(LOG_HANDLER_NAME)
+    queue_handler.addFilter(RateLimitFilter(max_records, interval, sample_every))
+    output_handler = UnrealLogHandler()
+    output_handler.setFormatter(logging.Formatter('[%(name)s] %(message)s'))
+    queue_handler.listener = logging.handlers.QueueListener(log_queue, output_handler)
+    queue_handler.listener.start()
+    bridge_logger.addHandler(queue_handler)
+    return bridge_logger
+
+
+logger = configure_logging()
+net_log = logging.getLogger('maya_unreal_bridge.net')
+recv_log = logging.getLogger('maya_unreal_bridge.recv')
+send_log = logging.getLogger('maya_unreal_bridge.send')
+import_log = logging.getLogger('maya_unreal_bridge.import')
+
+
+def encode_frame(message, compress=False, threshold=COMPRESSION_THRESHOLD, level=COMPRESSION_LEVEL):
+    payload = message.encode('utf-8')
+    if compress and len(payload) > threshold:
+        payload = COMPRESSED_FRAME_FLAG + base64.b64encode(zlib.compress(payload, level))
+    return payload + b'\n'
+
+
+def decode_frame(line):
+    if line.startswith(COMPRESSED_FRAME_FLAG):
+        line = zlib.decompress(base64.b64decode(line[len(COMPRESSED_FRAME_FLAG):]))
+    return line.decode('utf-8')
+
+
+def split_lines(buffer, scan_from=0):
+    """Pop complete newline-terminated lines off the front of a bytearray.
+
+    Returns the lines and the offset to resume scanning from next time, so a
+    large message arriving over many reads is not rescanned from the start.
+    """
+    lines = []
+    start = 0
+    while True:
+        newline = buffer.find(b'\n', scan_from)
+        if newline < 0:
+            break
+        lines.append(bytes(buffer[start:newline]))
+        start = scan_from = newline + 1
+    del buffer[:start]
+    return lines, len(buffer)
+
+
+def _multiply_matrices(a, b):
+    return [[sum(a[row][k] * b[k][column] for k in range(4)) for column in range(4)] for row in range(4)]
+
+
+def _build_conversion_matrices():
+    """Return the Maya-to-Unreal conversion matrix and its inverse as row-major lists.
+
+    Like FMatrix, these act on row vectors and match what the Alembic importer
+    builds from ``conversion_settings``: scale, then FQuat::MakeFromEuler(rotation).
+    """
+    roll, pitch, yaw = (math.radians(angle) for angle in MAYA_TO_UNREAL_ROTATION)
+    sr, cr = math.sin(roll), math.cos(roll)
+    sp, cp = math.sin(pitch), math.cos(pitch)
+    sy, cy = math.sin(yaw), math.cos(yaw)
+    rotation = [
+        [cp * cy, cp * sy, sp, 0.0],
+        [sr * sp * cy - cr * sy, sr * sp * sy + cr * cy, -sr * cp, 0.0],
+        [-(cr * sp * cy + sr * sy), cy * sr - cr * sp * sy, cr * cp, 0.0],
+        [0.0, 0.0, 0.0, 1.0],
+    ]
+    scale = [[MAYA_TO_UNREAL_SCALE[row] if row == column and row < 3 else float(row == column)
+              for column in range(4)] for row in range(4)]
+    inverse_scale = [[1.0 / value if value else 0.0 for value in row] for row in scale]
+    rotation_transposed = [list(column) for column in zip(*rotation)]
+    return (_multiply_matrices(scale, rotation),
+            _multiply_matrices(rotation_transposed, inverse_scale))
+
+
+CONVERSION_MATRIX, CONVERSION_MATRIX_INVERSE = _build_conversion_matrices()
+if np is not None:
+    CONVERSION_MATRIX_NP = np.array(CONVERSION_MATRIX)
+    CONVERSION_MATRIX_INVERSE_NP = np.array(CONVERSION_MATRIX_INVERSE)
+
+
+def decode_baked_matrices(data):
+    """Unpack a bake_transforms reply into a (frames, objects, 4, 4) array or nested lists."""
+    raw = base64.b64decode(data['matrices'])
+    frame_count, object_count = data['shape'][:2]
+    if np is not None:
+        return np.frombuffer(raw, dtype=data.get('dtype', '<f8')).reshape(frame_count, object_count, 4, 4)
+
+    values = array.array('d')
+    values.frombytes(raw)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return [[[list(values[offset + row * 4:offset + row * 4 + 4]) for row in range(4)]
+             for offset in range(frame * object_count * 16, (frame + 1) * object_count * 16, 16)]
+            for frame in range(frame_count)]
+
+
+def convert_maya_matrices(matrices):
+    """Re-express Maya world matrices in Unreal's basis as C^-1 * M * C.
+
+    With NumPy this is two broadcast matmuls over every frame and object at
+    once; without it, the same product is computed per matrix.
+    """
+    if np is not None:
+        return np.matmul(np.matmul(CONVERSION_MATRIX_INVERSE_NP, matrices), CONVERSION_MATRIX_NP)
+    return [[_multiply_matrices(_multiply_matrices(CONVERSION_MATRIX_INVERSE, matrix), CONVERSION_MATRIX)
+             for matrix in frame] for frame in matrices]
+
+
+class MayaEndpoint:
+    """A named Maya server and the per-connection state the client keeps for it.
+
+    The socket and buffers belong to the client's I/O thread; the game thread
+    only reads ``message_queue`` and the sequencing/callback state.
+    """
+
+    def __init__(self, name, host, port):
+        self.name = name
+        self.host = host
+        self.port = port
         self.socket = None
-        self.is_connected = False
-        self.receive_thread = None
+        self.state = 'disconnected'
+        self.recv_buffer = bytearray()
+        self.recv_scanned = 0
+        self.send_buffer = bytearray()
+        self.outgoing = queue.Queue()
+        self.message_queue = queue.Queue()
         self.response_callbacks = {}
+        self.user_disconnect = False
+        self.reconnect_attempt = 0
+        self.next_connect_time = None
+        # Auto-reconnect only applies once a connection has been made; a
+        # failed first connect usually means a wrong host or port.
+        self.was_connected = False
+        # Identifies the latest name lookup so a stale one is ignored after a
+        # disconnect and reconnect.
+        self.pending_resolve = None
+        # Set once Maya accepts zlib in its hello reply.
+        self.compression = False
+        # Last broadcast seen from this Maya, sent back on reconnect so the
+        # server can replay whatever was missed in between.
+        self.server_session = None
+        self.last_seq = 0
+
+    @property
+    def is_connected(self):
+        return self.state == 'connected'
+
+    def __repr__(self):
+        return f"'{self.name}' ({self.host}:{self.port})"
+
+
+class UnrealMayaSocketClient:
+    def __init__(self):
+        self.endpoints = {}
+        self.lock = threading.Lock()
         self.last_command_id = 0
-        self.message_queue = queue.Queue()
-        self.disconnect_requested = False
+        self.main_thread_tasks = queue.Queue()
+        # A single worker keeps imports in the order Maya broadcast them.
+        self.fingerprint_executor = ThreadPoolExecutor(max_workers=1)
+        self.worker_pool = ThreadPoolExecutor(max_workers=2)
         self.timer_handle = None
+        self.auto_reconnect = True
+        self.tick_budget = TICK_BUDGET_SECONDS
+        self.compression_enabled = True
+        self.compression_threshold = COMPRESSION_THRESHOLD
+        self.compression_level = COMPRESSION_LEVEL
+        # One selector thread services every endpoint; other threads hand it
+        # work through io_requests and wake it with the socketpair.
+        self.selector = selectors.DefaultSelector()
+        self.io_requests = queue.Queue()
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.wakeup_writer.setblocking(False)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ, None)
+        self.io_thread = None
         self.setup_message_processor()
 
+    @property
+    def is_connected(self):
+        return any(endpoint.is_connected for endpoint in self.endpoints.values())
+
     def setup_message_processor(self):
         if not self.timer_handle:
             self.timer_handle = unreal.register_slate_post_tick_callback(self.process_message_queue)
 
     def process_message_queue(self, delta_time):
+        deadline = time.perf_counter() + self.tick_budget
         try:
-            if self.disconnect_requested:
-                self._perform_disconnect()
-                self.disconnect_requested = False
+            # Round-robin over endpoints so one busy Maya cannot starve the others.
+            # At least one pass runs every tick, even if it overruns the budget.
+            while True:
+                processed = False
+                for endpoint in list(self.endpoints.values()):
+                    try:
+                        message = endpoint.message_queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    processed = True
+                    self.process_message(endpoint, message)
+                if not processed or time.perf_counter() >= deadline:
+                    break
 
-            while not self.message_queue.empty():
+            while not self.main_thread_tasks.empty():
                 try:
-                    message = self.message_queue.get_nowait()
-                    self.process_message(message)
+                    task = self.main_thread_tasks.get_nowait()
+                    task()
                 except queue.Empty:
                     break
+                if time.perf_counter() >= deadline:
+                    break
         except Exception as e:
-            unreal.log_error(f"Error in message processor: {str(e)}")
+            net_log.error("Error in message processor: %s", e)
 
         return True
 
-    def connect(self):
-        if self.is_connected:
-            unreal.log("Already connected to Maya")
-            return False
-
-        try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((HOST, PORT))
-            self.is_connected = True
-            self.disconnect_requested = False
-
-            unreal.log(f"Connected to Maya server at {HOST}:{PORT}")
-
-            self.receive_thread = threading.Thread(target=self.receive_messages)
-            self.receive_thread.daemon = True
-            self.receive_thread.start()
-
-            self.send_command('ping', {})
-            return True
-        except Exception as e:
-            unreal.log_error(f"Failed to connect to Maya: {str(e)}")
+    def connect(self, name=DEFAULT_ENDPOINT, host=HOST, port=PORT):
+        """Start connecting to a Maya server in the background.
+
+        Returns True once the attempt is scheduled, not when it succeeds;
+        check ``endpoints[name].is_connected`` or the log for the outcome. If this first
+        attempt fails the endpoint stays disconnected until ``connect`` is
+        called again; only connections that were up are retried automatically.
+        """
+        endpoint = self.endpoints.get(name)
+        if endpoint and endpoint.state != 'disconnected':
+            net_log.info("Already connected to Maya %s", endpoint)
             return False
 
-    def disconnect(self):
-        if not self.is_connected:
-            unreal.log("Not connected to Maya")
-            return
-        self.disconnect_requested = True
-        unreal.log("Disconnect requested")
+        if not endpoint or (endpoint.host, endpoint.port) != (host, port):
+            endpoint = MayaEndpoint(name, host, port)
+            self.endpoints[name] = endpoint
+        endpoint.user_disconnect = False
+        endpoint.was_connected = False
+        endpoint.reconnect_attempt = 0
+        endpoint.next_connect_time = time.monotonic()
+
+        self._ensure_io_thread()
+        self._wake_io_thread()
+        net_log.info("Connecting to Maya %s", endpoint)
+        return True
 
-    def send_command(self, command, params=None, callback=None):
-        if not self.is_connected:
-            unreal.log_error("Not connected to Maya server")
+    def disconnect(self, name=None):
+        names = [name] if name else list(self.endpoints)
+        for endpoint_name in names:
+            endpoint = self.endpoints.get(endpoint_name)
+            if not endpoint or endpoint.state == 'disconnected' and endpoint.next_connect_time is None:
+                net_log.info("Not connected to Maya '%s'", endpoint_name)
+                continue
+            endpoint.user_disconnect = True
+            self._call_in_io_thread(lambda endpoint=endpoint: self._close_endpoint(endpoint))
+            net_log.info("Disconnect requested for Maya %s", endpoint)
+
+    def send_command(self, command, params=None, callback=None, endpoint=DEFAULT_ENDPOINT):
+        target = self.endpoints.get(endpoint)
+        if not target or not target.is_connected:
+            net_log.error("Not connected to Maya server '%s'", endpoint)
             return False
         if params is None:
             params = {}
-        self.last_command_id += 1
-        command_id = self.last_command_id
+        with self.lock:
+            self.last_command_id += 1
+            command_id = self.last_command_id
         data = {'command': command, 'id': command_id, **params}
         if callback:
-            self.response_callbacks[command_id] = callback
+            target.response_callbacks[command_id] = callback
         try:
-            message = json.dumps(data)
-            self.socket.sendall(message.encode('utf-8'))
-            unreal.log(f"Sent to Maya: {command} (ID: {command_id})")
+            # Framing and compression happen on the I/O thread.
+            target.outgoing.put(json.dumps(data))
+            self._wake_io_thread()
+            send_log.debug("Sent to Maya %s: %s (ID: %s)", target, command, command_id)
             return command_id
         except Exception as e:
-            unreal.log_error(f"Error sending command to Maya: {str(e)}")
-            self.disconnect()
+            send_log.error("Error sending command to Maya %s: %s", target, e)
+            target.response_callbacks.pop(command_id, None)
             return False
 
-    def _perform_disconnect(self):
-        unreal.log("Disconnecting from Maya")
-        self.is_connected = False
-        if self.socket:
-            try:
-                self.socket.close()
-            except:
-                pass
-            self.socket = None
-        self.response_callbacks = {}
-        unreal.log("Disconnected from Maya")
+    def bake_transforms(self, objects, start_frame=None, end_frame=None, step=1.0,
+                        callback=None, endpoint=DEFAULT_ENDPOINT):
+        """Sample the world matrices of ``objects`` over a frame range in one Maya pass.
+
+        ``callback`` runs on the game thread with the reply, whose ``matrices``
+        have been decoded and converted to Unreal axes on a worker thread as a
+        (frames, objects, 4, 4) array.
+        """
+        params = {'objects': list(objects), 'step': step}
+        if start_frame is not None:
+            params['start_frame'] = start_frame
+        if end_frame is not None:
+            params['end_frame'] = end_frame
+
+        def on_reply(data):
+            if data.get('status') != 'ok':
+                if callback:
+                    callback(data)
+                return
+            self.worker_pool.submit(self._convert_baked_transforms, data, callback)
+
+        return self.send_command('bake_transforms', params, callback=on_reply, endpoint=endpoint)
+
+    def _convert_baked_transforms(self, data, callback):
+        try:
+            data['matrices'] = convert_maya_matrices(decode_baked_matrices(data))
+        except Exception as e:
+            import_log.error("Could not decode baked transforms: %s", e)
+            data = {'status': 'error', 'message': str(e)}
+        if callback:
+            self.main_thread_tasks.put(lambda: callback(data))
+
+    def baked_matrices_to_transforms(self, matrices):
+        """Turn converted (frames, objects, 4, 4) matrices into one list of unreal.Transform per object."""
+        transforms = [[] for _ in range(len(matrices[0]))] if len(matrices) else []
+        for frame in matrices:
+            for index, matrix in enumerate(frame):
+                planes = [unreal.Plane(*[float(value) for value in row]) for row in matrix]
+                transforms[index].append(unreal.MathLibrary.conv_matrix_to_transform(
+                    unreal.Matrix(x_plane=planes[0], y_plane=planes[1], z_plane=planes[2], w_plane=planes[3])))
+        return transforms
+
+    def request_export(self, scene_file, roots, frame_range=None, material_import_method='find',
+                       callback=None, endpoint=DEFAULT_ENDPOINT):
+        """Ask a headless Maya export service to export ``roots`` from ``scene_file``.
+
+        The finished file arrives later as a regular ``import_alembic`` broadcast.
+        """
+        params = {
+            'scene_file': scene_file,
+            'roots': list(roots),
+            'material_import_method': material_import_method
+        }
+        if frame_range:
+            params['frame_range'] = list(frame_range)
+        return self.send_command('export', params, callback=callback, endpoint=endpoint)
+
+    def _ensure_io_thread(self):
+        if self.io_thread and self.io_thread.is_alive():
+            return
+        self.io_thread = threading.Thread(target=self._io_loop)
+        self.io_thread.daemon = True
+        self.io_thread.start()
+
+    def _wake_io_thread(self):
+        try:
+            self.wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _call_in_io_thread(self, request):
+        self.io_requests.put(request)
+        self._wake_io_thread()
 
-    def receive_messages(self):
-        self.socket.settimeout(1.0)
-        while self.is_connected:
+    def _io_loop(self):
+        while True:
             try:
-                data = self.socket.recv(BUFFER_SIZE)
-                if not data:
-                    unreal.log("Connection to Maya server closed")
-                    break
-                message = data.decode('utf-8')
-                self.message_queue.put(message)
-            except socket.timeout:
-                continue
+                timeout = self._connect_due_endpoints()
+                for key, mask in self.selector.select(timeout):
+                    if key.data is None:
+                        try:
+                            while self.wakeup_reader.recv(BUFFER_SIZE):
+                                pass
+                        except (BlockingIOError, OSError):
+                            pass
+                        continue
+                    endpoint = key.data
+                    if endpoint.state == 'connecting':
+                        self._finish_connect(endpoint)
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read_endpoint(endpoint)
+                    if mask & selectors.EVENT_WRITE and endpoint.is_connected:
+                        self._flush_endpoint(endpoint)
+
+                while not self.io_requests.empty():
+                    self.io_requests.get_nowait()()
+                for endpoint in list(self.endpoints.values()):
+                    if endpoint.is_connected and (endpoint.send_buffer or not endpoint.outgoing.empty()):
+                        self._flush_endpoint(endpoint)
             except Exception as e:
-                if self.is_connected:
-                    unreal.log_error(f"Error receiving data from Maya: {str(e)}")
-                break
+                net_log.error("Error in Maya I/O thread: %s", e)
+
+    def _connect_due_endpoints(self):
+        """Start connects that are due; return the selector timeout until the next one."""
+        now = time.monotonic()
+        timeout = 1.0
+        for endpoint in list(self.endpoints.values()):
+            if (endpoint.state != 'disconnected' or endpoint.next_connect_time is None
+                    or endpoint.user_disconnect):
+                continue
+            if endpoint.next_connect_time <= now:
+                endpoint.next_connect_time = None
+                # Name lookups block, so they run on the worker pool rather
+                # than stalling every other endpoint on this thread.
+                endpoint.state = 'resolving'
+                endpoint.pending_resolve = token = object()
+                self.worker_pool.submit(self._resolve_endpoint, endpoint, token)
+            else:
+                timeout = min(timeout, endpoint.next_connect_time - now)
+        return max(timeout, 0.0)
 
-        self.disconnect_requested = True
+    def _resolve_endpoint(self, endpoint, token):
+        try:
+            address = socket.getaddrinfo(endpoint.host, endpoint.port, socket.AF_INET, socket.SOCK_STREAM)[0][4]
+            reason = None
+        except OSError as e:
+            address, reason = None, str(e)
+        self._call_in_io_thread(lambda: self._on_resolved(endpoint, token, address, reason))
+
+    def _on_resolved(self, endpoint, token, address, reason):
+        if endpoint.pending_resolve is not token or endpoint.state != 'resolving':
+            return
+        endpoint.pending_resolve = None
+        endpoint.state = 'disconnected'
+        if address is None:
+            self._connection_failed(endpoint, reason)
+        else:
+            self._start_connect(endpoint, address)
+
+    def _start_connect(self, endpoint, address):
+        sock = None
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            error = sock.connect_ex(address)
+            reason = None if error in CONNECT_IN_PROGRESS else os.strerror(error)
+        except OSError as e:
+            reason = str(e)
+        if reason is not None:
+            if sock is not None:
+                sock.close()
+            self._connection_failed(endpoint, reason)
+            return
+        endpoint.socket = sock
+        endpoint.state = 'connecting'
+        self.selector.register(sock, selectors.EVENT_WRITE, endpoint)
+
+    def _finish_connect(self, endpoint):
+        error = endpoint.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            self._close_endpoint(endpoint)
+            self._connection_failed(endpoint, os.strerror(error))
+            return
+        endpoint.state = 'connected'
+        endpoint.was_connected = True
+        endpoint.reconnect_attempt = 0
+        self.selector.modify(endpoint.socket, selectors.EVENT_READ, endpoint)
+        net_log.info("Connected to Maya server %s", endpoint)
+
+        self.send_command('ping', {}, endpoint=endpoint.name)
+        hello = {
+            'session': endpoint.server_session,
+            'last_seq': endpoint.last_seq,
+            'compression': ['zlib'] if self.compression_enabled else []
+        }
+        self.send_command('hello', hello,
+                          callback=lambda data: self._on_resumed(endpoint, data), endpoint=endpoint.name)
+
+    def _connection_failed(self, endpoint, reason):
+        if not endpoint.was_connected:
+            net_log.error("Failed to connect to Maya %s: %s", endpoint, reason)
+            return
+        self._schedule_reconnect(endpoint)
+
+    def _schedule_reconnect(self, endpoint):
+        if endpoint.user_disconnect or not self.auto_reconnect:
+            return
+        # Full jitter keeps several editors from hammering a restarting
+        # Maya in lockstep.
+        delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * (2 ** endpoint.reconnect_attempt))
+        endpoint.reconnect_attempt += 1
+        endpoint.next_connect_time = time.monotonic() + random.uniform(0, delay)
+        if endpoint.reconnect_attempt > 1:
+            net_log.info("Reconnecting to Maya %s (attempt %s)...", endpoint, endpoint.reconnect_attempt)
+
+    def _read_endpoint(self, endpoint):
+        try:
+            data = endpoint.socket.recv(BUFFER_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as e:
+            net_log.error("Error receiving data from Maya %s: %s", endpoint, e)
+            data = b''
+        if not data:
+            net_log.info("Connection to Maya server %s closed", endpoint)
+            self._close_endpoint(endpoint)
+            self._schedule_reconnect(endpoint)
+            return
+
+        # Maya sends newline-delimited JSON; pipelined exports can put
+        # several broadcasts into a single recv.
+        endpoint.recv_buffer += data
+        lines, endpoint.recv_scanned = split_lines(endpoint.recv_buffer, endpoint.recv_scanned)
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                endpoint.message_queue.put(decode_frame(line))
+            except (zlib.error, ValueError) as e:
+                recv_log.error("Discarding undecodable message from Maya %s: %s", endpoint, e)
+
+    def _flush_endpoint(self, endpoint):
+        while not endpoint.outgoing.empty():
+            endpoint.send_buffer += encode_frame(endpoint.outgoing.get_nowait(), endpoint.compression,
+                                                 self.compression_threshold, self.compression_level)
+        try:
+            if endpoint.send_buffer:
+                sent = endpoint.socket.send(endpoint.send_buffer)
+                del endpoint.send_buffer[:sent]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except Exception as e:
+            send_log.error("Error sending command to Maya %s: %s", endpoint, e)
+            self._close_endpoint(endpoint)
+            self._schedule_reconnect(endpoint)
+            return
+        events = selectors.EVENT_READ
+        if endpoint.send_buffer:
+            events |= selectors.EVENT_WRITE
+        self.selector.modify(endpoint.socket, events, endpoint)
+
+    def _close_endpoint(self, endpoint):
+        if endpoint.socket:
+            try:
+                self.selector.unregister(endpoint.socket)
+            except (KeyError, ValueError):
+                pass
+            try:
+                endpoint.socket.close()
+            except:
+                pass
+            endpoint.socket = None
+        if endpoint.state == 'connected':
+            net_log.info("Disconnected from Maya %s", endpoint)
+        endpoint.state = 'disconnected'
+        endpoint.next_connect_time = None
+        endpoint.recv_buffer = bytearray()
+        endpoint.recv_scanned = 0
+        endpoint.send_buffer = bytearray()
+        endpoint.compression = False
+        while not endpoint.outgoing.empty():
+            endpoint.outgoing.get_nowait()
+        endpoint.response_callbacks = {}
+
+    def _on_resumed(self, endpoint, data):
+        endpoint.compression = data.get('compression') == 'zlib'
+        session = data.get('session')
+        if session != endpoint.server_session:
+            # First contact or Maya restarted: nothing from before is replayable.
+            endpoint.server_session = session
+            endpoint.last_seq = data.get('seq', 0)
+        if data.get('replayed'):
+            net_log.info("Replayed %s missed message(s) from Maya %s", data['replayed'], endpoint)
+        if data.get('resync_required'):
+            net_log.warning("Messages from Maya %s were lost while disconnected; re-export to resync", endpoint)
+
+    def _accept_sequenced(self, endpoint, data):
+        session = data.get('session')
+        seq = data.get('seq', 0)
+        if session != endpoint.server_session:
+            endpoint.server_session = session
+            endpoint.last_seq = 0
+        if seq <= endpoint.last_seq:
+            return False
+        endpoint.last_seq = seq
+        return True
 
-    def process_message(self, message):
+    def process_message(self, endpoint, message):
         try:
             data = json.loads(message)
-            unreal.log(f"Received from Maya: {message}")
+            recv_log.debug("Received from Maya %s: %s", endpoint, message)
+            # Only broadcasts are sequenced; the hello reply also reports 'seq'.
+            if 'command' in data and 'seq' in data and not self._accept_sequenced(endpoint, data):
+                recv_log.debug("Skipping already processed message %s from Maya %s", data['seq'], endpoint)
+                return
             if 'command' in data:
                 command = data['command']
                 if command == 'import_alembic':
@@ -136,23 +728,48 @@ class UnrealMayaSocketClient:
                     objects = data.get('objects', [])
                     material_import_method = data.get('material_import_method', 'find')
                     if file_path:
-                        unreal.log(f"Importing Alembic from: {file_path}")
+                        if 'part_index' in data:
+                            import_log.info("Importing Alembic part %s/%s of batch %s from Maya %s: %s",
+                                            data['part_index'] + 1, data.get('part_count', '?'),
+                                            data.get('batch_id'), endpoint, file_path)
+                        else:
+                            import_log.info("Importing Alembic from Maya %s: %s", endpoint, file_path)
                         self.import_alembic(file_path, material_import_method)
                     else:
-                        unreal.log_error("No file path provided for Alembic import")
+                        import_log.error("No file path provided for Alembic import")
+                elif command == 'import_alembic_batch_complete':
+                    batch_id = data.get('batch_id')
+                    file_count = len(data.get('file_paths', []))
+                    if data.get('failed'):
+                        report = lambda: import_log.error(
+                            "Alembic batch %s failed in Maya after %s file(s)", batch_id, file_count)
+                    elif data.get('cancelled'):
+                        report = lambda: import_log.warning(
+                            "Alembic batch %s was cancelled in Maya after %s file(s)", batch_id, file_count)
+                    else:
+                        report = lambda: import_log.info(
+                            "Alembic batch %s complete: %s file(s) imported", batch_id, file_count)
+                    # Queue behind the batch's pending imports so this is reported last.
+                    self.fingerprint_executor.submit(self.main_thread_tasks.put, report)
+                elif command == 'export_failed':
+                    import_log.error("Export job %s for %s failed on Maya %s: %s", data.get('job_id'),
+                                     data.get('scene_file'), endpoint, data.get('message', 'Unknown error'))
 
             elif 'status' in data:
                 status = data['status']
+                callback = endpoint.response_callbacks.pop(data.get('id'), None)
+                if callback:
+                    callback(data)
                 if status == 'ok':
                     if data.get('message') == 'pong':
-                        unreal.log("Ping successful - Maya server is responsive")
+                        net_log.debug("Ping successful - Maya server %s is responsive", endpoint)
                 else:
-                    unreal.log_error(f"Error from Maya: {data.get('message', 'Unknown error')}")
+                    net_log.error("Error from Maya %s: %s", endpoint, data.get('message', 'Unknown error'))
 
         except json.JSONDecodeError:
-            unreal.log_error(f"Received invalid JSON from Maya: {message}")
+            recv_log.error("Received invalid JSON from Maya %s: %s", endpoint, message)
         except Exception as e:
-            unreal.log_error(f"Error processing message from Maya: {str(e)}")
+            net_log.error("Error processing message from Maya %s: %s", endpoint, e)
 
     def reimport_alembic(self, existing_asset, source_file_path, material_import_method):
         reimport_task = unreal.AssetImportTask()
@@ -165,18 +782,18 @@ class UnrealMayaSocketClient:
 
         options = unreal.AbcImportSettings()
         options.geometry_cache_settings.motion_vectors = unreal.AbcGeometryCacheMotionVectorsImport.IMPORT_ABC_VELOCITIES_AS_MOTION_VECTORS
-        options.conversion_settings.scale = unreal.Vector(1.0, -1.0, 1.0)
-        options.conversion_settings.rotation = unreal.Vector(90.0, 0.0, 0.0)
+        options.conversion_settings.scale = unreal.Vector(*MAYA_TO_UNREAL_SCALE)
+        options.conversion_settings.rotation = unreal.Vector(*MAYA_TO_UNREAL_ROTATION)
         options.material_settings.find_materials = (material_import_method == 'find')
         options.material_settings.create_materials = (material_import_method == 'create')
         reimport_task.options = options
 
         try:
             unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([reimport_task])
-            unreal.log(f"Reimported Alembic: {existing_asset.package_name}")
+            import_log.info("Reimported Alembic: %s", existing_asset.package_name)
             return True
         except Exception as e:
-            unreal.log_error(f"Failed to reimport Alembic: {str(e)}")
+            import_log.error("Failed to reimport Alembic: %s", e)
             return False
 
     def import_new_alembic(self, file_path, destination_path, material_import_method):
@@ -192,47 +809,137 @@ class UnrealMayaSocketClient:
         options.geometry_cache_settings.motion_vectors = unreal.AbcGeometryCacheMotionVectorsImport.IMPORT_ABC_VELOCITIES_AS_MOTION_VECTORS
         options.conversion_settings.flip_u = False
         options.conversion_settings.flip_v = True
-        options.conversion_settings.scale = unreal.Vector(1.0, -1.0, 1.0)
-        options.conversion_settings.rotation = unreal.Vector(90.0, 0.0, 0.0)
+        options.conversion_settings.scale = unreal.Vector(*MAYA_TO_UNREAL_SCALE)
+        options.conversion_settings.rotation = unreal.Vector(*MAYA_TO_UNREAL_ROTATION)
         options.material_settings.find_materials = (material_import_method == 'find')
         options.material_settings.create_materials = (material_import_method == 'create')
         task.options = options
 
-        unreal.log("Executing Alembic import task...")
+        import_log.debug("Executing Alembic import task...")
         unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
 
-        unreal.log(f"Successfully imported Alembic to {destination_path}")
+        import_log.info("Successfully imported Alembic to %s", destination_path)
+        return True
+
+    def compute_source_fingerprint(self, file_path, material_import_method, include_hash=True):
+        """Fingerprint an .abc file; runs on the fingerprint worker, not the game thread.
+
+        With ``include_hash`` False only size and mtime are read and ``hash`` is None.
+        """
+        stat = os.stat(file_path)
+        file_hash = None
+        if include_hash:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(file_path, 'rb') as source_file:
+                for chunk in iter(lambda: source_file.read(HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            file_hash = digest.hexdigest()
+        return {
+            'size': str(stat.st_size),
+            'mtime': str(stat.st_mtime_ns),
+            'hash': file_hash,
+            'settings': material_import_method,
+        }
+
+    def read_source_fingerprint(self, asset_path):
+        asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+        if not asset:
+            return None
+        return {key: unreal.EditorAssetLibrary.get_metadata_tag(asset, tag)
+                for key, tag in FINGERPRINT_TAGS.items()}
+
+    def write_source_fingerprint(self, asset_path, fingerprint):
+        asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+        if not asset:
+            import_log.warning("Could not record source fingerprint on %s", asset_path)
+            return False
+        for key, tag in FINGERPRINT_TAGS.items():
+            unreal.EditorAssetLibrary.set_metadata_tag(asset, tag, fingerprint[key])
+        unreal.EditorAssetLibrary.save_loaded_asset(asset)
+        return True
 
     def import_alembic(self, file_path, material_import_method='find'):
         try:
             if not os.path.exists(file_path):
-                unreal.log_error(f"Alembic file not found: {file_path}")
+                import_log.error("Alembic file not found: %s", file_path)
                 return False
             file_name = os.path.basename(file_path)
             base_name = os.path.splitext(file_name)[0]
             selected_path = self.get_selected_content_browser_path()
             if not selected_path:
-                unreal.log_error("No folder selected in Content Browser. Please select a destination folder first.")
+                import_log.error("No folder selected in Content Browser. Please select a destination folder first.")
                 return False
             destination_folder = selected_path
             asset_name = base_name
             full_asset_path = f"{destination_folder}/{asset_name}"
-            unreal.log(f"Looking for asset at: {full_asset_path}")
+            stored = None
+            if unreal.EditorAssetLibrary.find_asset_data(full_asset_path).is_valid():
+                stored = self.read_source_fingerprint(full_asset_path)
+            self.fingerprint_executor.submit(
+                self._fingerprint_then_import, file_path, destination_folder, asset_name,
+                material_import_method, stored)
+            return True
+        except Exception as e:
+            error_details = traceback.format_exc()
+            import_log.error("Error importing Alembic: %s\n%s", e, error_details)
+            return False
+
+    def _fingerprint_then_import(self, file_path, destination_folder, asset_name, material_import_method,
+                                 stored):
+        try:
+            # A size change already proves the source changed, so the import
+            # goes ahead without waiting for a hash; it is recorded afterwards.
+            size_matches = bool(stored) and stored['size'] == str(os.path.getsize(file_path))
+            fingerprint = self.compute_source_fingerprint(file_path, material_import_method,
+                                                          include_hash=size_matches)
+        except Exception as e:
+            import_log.warning("Could not fingerprint %s, importing without it: %s", file_path, e)
+            fingerprint = None
+        self.main_thread_tasks.put(
+            lambda: self._import_alembic_with_fingerprint(
+                file_path, destination_folder, asset_name, material_import_method, fingerprint))
+
+    def _import_alembic_with_fingerprint(self, file_path, destination_folder, asset_name,
+                                         material_import_method, fingerprint):
+        try:
+            full_asset_path = f"{destination_folder}/{asset_name}"
+            import_log.debug("Looking for asset at: %s", full_asset_path)
             existing_asset = unreal.EditorAssetLibrary.find_asset_data(full_asset_path)
             if existing_asset.is_valid():
-                unreal.log(f"Asset already exists at {full_asset_path}. Reimporting...")
-                self.reimport_alembic(existing_asset, file_path, material_import_method)
+                stored = None
+                if fingerprint and fingerprint['hash']:
+                    stored = self.read_source_fingerprint(full_asset_path)
+                if (stored and stored['hash'] == fingerprint['hash']
+                        and stored['settings'] == fingerprint['settings']):
+                    import_log.info("Source of %s is unchanged. Skipping reimport.", full_asset_path)
+                    if stored['mtime'] != fingerprint['mtime']:
+                        self.write_source_fingerprint(full_asset_path, fingerprint)
+                    return True
+                import_log.info("Asset already exists at %s. Reimporting...", full_asset_path)
+                imported = self.reimport_alembic(existing_asset, file_path, material_import_method)
             else:
-                unreal.log(f"Importing new Alembic asset to {destination_folder}")
-                self.import_new_alembic(file_path, destination_folder, material_import_method)
-            return True
+                import_log.info("Importing new Alembic asset to %s", destination_folder)
+                imported = self.import_new_alembic(file_path, destination_folder, material_import_method)
+            if imported and fingerprint:
+                if fingerprint['hash']:
+                    self.write_source_fingerprint(full_asset_path, fingerprint)
+                else:
+                    self.fingerprint_executor.submit(
+                        self._record_fingerprint_after_import, file_path, full_asset_path, material_import_method)
+            return imported
         except Exception as e:
-            import traceback
             error_details = traceback.format_exc()
-            unreal.log_error(f"Error importing Alembic: {str(e)}")
-            unreal.log_error(f"Error details: {error_details}")
+            import_log.error("Error importing Alembic: %s\n%s", e, error_details)
             return False
 
+    def _record_fingerprint_after_import(self, file_path, asset_path, material_import_method):
+        try:
+            fingerprint = self.compute_source_fingerprint(file_path, material_import_method)
+        except Exception as e:
+            import_log.warning("Could not fingerprint %s: %s", file_path, e)
+            return
+        self.main_thread_tasks.put(lambda: self.write_source_fingerprint(asset_path, fingerprint))
+
     def get_selected_content_browser_path(self):
         try:
             selected_path = None
@@ -255,25 +962,26 @@ class UnrealMayaSocketClient:
                         selected_path = '/Game/' + selected_path
 
                 if selected_path == "/Game/Game":
-                    unreal.log_error(
+                    import_log.error(
                         "Detected default path '/Game/Game'. Please select a specific folder in Content Browser.")
                     return None
-                unreal.log(f"Selected path (cleaned): {selected_path}")
+                import_log.debug("Selected path (cleaned): %s", selected_path)
                 return selected_path
             else:
-                unreal.log_error("No folder selected in Content Browser. Please select a destination folder first.")
+                import_log.error("No folder selected in Content Browser. Please select a destination folder first.")
                 return None
         except Exception as e:
-            unreal.log_error(f"Could not get selected Content Browser path: {str(e)}")
+            import_log.error("Could not get selected Content Browser path: %s", e)
             return None
 
 
 maya_client = UnrealMayaSocketClient()
 
 
-def connect_to_maya():
-    return maya_client.connect()
+def connect_to_maya(name=DEFAULT_ENDPOINT, host=HOST, port=PORT):
+    """Start connecting in the background; see UnrealMayaSocketClient.connect."""
+    return maya_client.connect(name, host, port)
 
 
-def disconnect_from_maya():
-    maya_client.disconnect()
\ No newline at end of file
+def disconnect_from_maya(name=None):
+    maya_client.disconnect(name)
\ No newline at end of file